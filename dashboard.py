@@ -7,8 +7,30 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
+from plotly_resampler import FigureResampler
+from plotly_resampler.aggregation import LTTB
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import os
+
+# Serialize figures with orjson
+pio.json.config.default_engine = "orjson"
+
+# Trend series longer than this are downsampled with LTTB before plotting
+MAX_TREND_POINTS = 5000
+
+# Columns the dashboard expects in the dataset
+REQUIRED_COLS = {'date', 'department', 'revenue', 'operating_cost', 'payroll_cost', 'profit',
+                 'gross_margin', 'payroll_ratio', 'operating_cost_ratio',
+                 'revenue_mom_change', 'profit_mom_change'}
+
+# Numeric columns of the dataset
+NUMERIC_COLS = ['revenue', 'operating_cost', 'payroll_cost', 'profit',
+                'gross_margin', 'payroll_ratio', 'operating_cost_ratio',
+                'revenue_mom_change', 'profit_mom_change']
 
 # Page Configuration
 st.set_page_config(
@@ -60,11 +82,27 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-@st.cache_data
-def load_data(file_path: str) -> pd.DataFrame:
-    """Load and cache the dataset"""
-    df = pd.read_csv(file_path)
-    return df
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_data(file_path: str, mtime: float, size: int) -> pd.DataFrame:
+    """Load, validate and clean the dataset once (Parquet, or CSV as a fallback)
+
+    mtime and size are only part of the cache key, so a changed file is reloaded;
+    max_entries evicts frames for older versions of the file instead of keeping them all.
+    The cached frame is shared across reruns without copying; treat it as read-only.
+    """
+    if file_path.endswith(".parquet"):
+        df = pd.read_parquet(file_path, engine="pyarrow")
+    else:
+        # Numeric columns are typed up front, so parsing and nulls are handled once in Arrow
+        convert_options = pa_csv.ConvertOptions(
+            column_types={col: pa.float64() for col in NUMERIC_COLS},
+            null_values=["", "NA", "NaN"],
+            strings_can_be_null=True
+        )
+        df = pa_csv.read_csv(file_path, convert_options=convert_options).to_pandas()
+
+    validate_schema(df)
+    return clean_data(df)
 
 
 def format_currency(value: float) -> str:
@@ -76,28 +114,103 @@ def format_currency(value: float) -> str:
     return f"${value:,.2f}"
 
 
+def format_currency_vec(series: pd.Series) -> pd.Series:
+    """Format a series as currency, branching once per array instead of per value"""
+    values = series.to_numpy(dtype=float)
+    magnitude = np.abs(values)
+    # Below 1,000 the only value that needs a thousands separator is one that rounds
+    # up to 1000.00, so patch that case to match format_currency's "{:,.2f}"
+    plain = np.char.replace(np.char.mod("%.2f", values), "1000.00", "1,000.00")
+    out = np.select(
+        [magnitude >= 1_000_000, magnitude >= 1_000],
+        [np.char.add(np.char.add("$", np.char.mod("%.2f", values / 1_000_000)), "M"),
+         np.char.add(np.char.add("$", np.char.mod("%.2f", values / 1_000)), "K")],
+        default=np.char.add("$", plain)
+    )
+    return pd.Series(out, index=series.index)
+
+
 def format_percentage(value: float) -> str:
     """Format value as percentage"""
     return f"{value*100:.2f}%"
 
 
+def format_percentage_vec(series: pd.Series) -> pd.Series:
+    """Format a series as percentages in one vectorized pass"""
+    values = series.to_numpy(dtype=float)
+    return pd.Series(np.char.mod("%.2f%%", values * 100), index=series.index)
+
+
+def format_change_vec(series: pd.Series) -> pd.Series:
+    """Format a series of fractional changes with an up/down arrow, '-' when missing"""
+    values = series.to_numpy(dtype=float)
+    pct = np.char.mod("%.1f%%", np.abs(values) * 100)
+    out = np.select(
+        [values > 0, ~np.isnan(values)],
+        [np.char.add("⬆️ ", pct), np.char.add("⬇️ ", pct)],
+        default="-"
+    )
+    return pd.Series(out, index=series.index)
+
+
+def validate_schema(df: pd.DataFrame) -> None:
+    """Raise if the dataset is missing any required column"""
+    missing = REQUIRED_COLS - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
+
+
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
-    """Clean and preprocess the data"""
-    df = df.copy()
+    """Clean and preprocess the data
 
+    Works in place on the freshly read frame; expects a frame that passed validate_schema.
+    """
     # Convert date column
-    if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+
+    # Categorical department: groupby hashes small integer codes instead of strings
+    df['department'] = df['department'].astype('category')
+
+    # Sort by date so date filters become a binary search
+    return df.sort_values('date', kind='stable', ignore_index=True)
+
 
-    # Fill missing values for numeric columns
-    numeric_cols = ['revenue', 'operating_cost', 'payroll_cost', 'profit',
-                   'gross_margin', 'payroll_ratio', 'operating_cost_ratio',
-                   'revenue_mom_change', 'profit_mom_change']
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+def filter_data(df: pd.DataFrame, start, end, dept: str) -> pd.DataFrame:
+    """Slice the date-sorted frame to the date range and department
 
-    return df
+    Uncached on purpose: a binary search plus iloc is cheaper than unpickling a cached copy.
+    """
+    lo, hi = 0, len(df)
+    if start is not None:
+        dates = df['date'].values
+        lo = np.searchsorted(dates, np.datetime64(start), side='left')
+        hi = np.searchsorted(dates, np.datetime64(end), side='right')
+    filtered = df.iloc[lo:hi]
+
+    if dept != "All":
+        code = filtered['department'].cat.categories.get_loc(dept)
+        filtered = filtered[filtered['department'].cat.codes.to_numpy() == code]
+
+    return filtered
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def aggregate_departments(_df: pd.DataFrame, data_key: tuple, start, end, dept: str) -> pd.DataFrame:
+    """Aggregate all department-level metrics in a single groupby
+
+    The frame is not hashed (Streamlit only samples large frames); the cache is keyed on
+    data_key (the file path, mtime and size) and the filter values that produced it,
+    and bounded so results for old file versions and filter combinations are evicted.
+    """
+    return _df.groupby('department', observed=True, sort=False).agg(
+        total_revenue=('revenue', 'sum'),
+        avg_revenue=('revenue', 'mean'),
+        total_profit=('profit', 'sum'),
+        avg_profit=('profit', 'mean'),
+        gross_margin=('gross_margin', 'mean'),
+        payroll_ratio=('payroll_ratio', 'mean'),
+        operating_cost_ratio=('operating_cost_ratio', 'mean')
+    ).reset_index()
 
 
 def create_kpi_cards(df: pd.DataFrame) -> None:
@@ -155,10 +268,18 @@ def create_trend_chart(df: pd.DataFrame) -> None:
 
     # Create dual-axis chart
     fig = make_subplots(specs=[[{"secondary_y": True}]])
+    if len(trend_df) > MAX_TREND_POINTS:
+        fig = FigureResampler(
+            fig,
+            default_n_shown_samples=MAX_TREND_POINTS,
+            default_downsampler=LTTB(),
+            resampled_trace_prefix_suffix=("", ""),
+            show_mean_aggregation_size=False
+        )
 
     # Revenue line
     fig.add_trace(
-        go.Scatter(
+        go.Scattergl(
             x=trend_df['date'],
             y=trend_df['revenue'],
             name="Revenue",
@@ -171,7 +292,7 @@ def create_trend_chart(df: pd.DataFrame) -> None:
 
     # Profit line
     fig.add_trace(
-        go.Scatter(
+        go.Scattergl(
             x=trend_df['date'],
             y=trend_df['profit'],
             name="Profit",
@@ -183,7 +304,7 @@ def create_trend_chart(df: pd.DataFrame) -> None:
     )
 
     fig.update_layout(
-        hovermode="x unified",
+        hovermode="x",
         legend=dict(orientation="h", yanchor="bottom", y=1.02),
         paper_bgcolor='white',
         plot_bgcolor='white',
@@ -197,30 +318,24 @@ def create_trend_chart(df: pd.DataFrame) -> None:
     st.plotly_chart(fig, width='stretch')
 
 
-def create_department_chart(df: pd.DataFrame) -> None:
+def create_department_chart(dept_agg: pd.DataFrame) -> None:
     """Create department-level revenue and profit bar chart"""
     st.markdown('<p class="section-header">Revenue & Profit by Department</p>', unsafe_allow_html=True)
 
-    # Aggregate by department
-    dept_df = df.groupby('department').agg({
-        'revenue': 'sum',
-        'profit': 'sum'
-    }).reset_index()
-
-    dept_df = dept_df.sort_values('revenue', ascending=True)
+    dept_df = dept_agg.sort_values('total_revenue', ascending=True)
 
     # Create grouped bar chart
     fig = go.Figure(data=[
         go.Bar(
             y=dept_df['department'],
-            x=dept_df['revenue'],
+            x=dept_df['total_revenue'],
             name='Revenue',
             orientation='h',
             marker_color='#667eea'
         ),
         go.Bar(
             y=dept_df['department'],
-            x=dept_df['profit'],
+            x=dept_df['total_profit'],
             name='Profit',
             orientation='h',
             marker_color='#10b981'
@@ -243,18 +358,11 @@ def create_department_chart(df: pd.DataFrame) -> None:
     st.plotly_chart(fig, width='stretch')
 
 
-def create_margin_comparison(df: pd.DataFrame) -> None:
+def create_margin_comparison(dept_agg: pd.DataFrame) -> None:
     """Create margin comparison by department"""
     st.markdown('<p class="section-header">Margin Analysis by Department</p>', unsafe_allow_html=True)
 
-    # Calculate margin by department
-    margin_df = df.groupby('department').agg({
-        'gross_margin': 'mean',
-        'payroll_ratio': 'mean',
-        'operating_cost_ratio': 'mean'
-    }).reset_index()
-
-    margin_df = margin_df.sort_values('gross_margin', ascending=False)
+    margin_df = dept_agg.sort_values('gross_margin', ascending=False)
 
     # Create bar chart
     fig = go.Figure()
@@ -288,69 +396,59 @@ def create_mom_variance_table(df: pd.DataFrame) -> None:
     """Create month-over-month variance table"""
     st.markdown('<p class="section-header">Month-over-Month Variance</p>', unsafe_allow_html=True)
 
-    # Create date column if not present
-    if 'date' in df.columns:
-        df['month'] = pd.to_datetime(df['date']).dt.to_period('M')
-
-        # Aggregate by month
-        mom_df = df.groupby('month').agg({
-            'revenue': 'sum',
-            'profit': 'sum',
-            'revenue_mom_change': 'mean',
-            'profit_mom_change': 'mean'
-        }).reset_index()
-
-        mom_df['month'] = mom_df['month'].astype(str)
-        mom_df = mom_df.sort_values('month', ascending=False)
-
-        # Format columns
-        mom_df['revenue'] = mom_df['revenue'].apply(format_currency)
-        mom_df['profit'] = mom_df['profit'].apply(format_currency)
-        mom_df['revenue_mom_change'] = mom_df['revenue_mom_change'].apply(
-            lambda x: f"⬆️ {x*100:.1f}%" if pd.notna(x) and x > 0 else (f"⬇️ {abs(x)*100:.1f}%" if pd.notna(x) else "-")
-        )
-        mom_df['profit_mom_change'] = mom_df['profit_mom_change'].apply(
-            lambda x: f"⬆️ {x*100:.1f}%" if pd.notna(x) and x > 0 else (f"⬇️ {abs(x)*100:.1f}%" if pd.notna(x) else "-")
-        )
+    # Floor to month on the raw datetime64 array; no Period objects are built
+    month = df['date'].values.astype('datetime64[M]')
 
-        mom_df.columns = ['Month', 'Revenue', 'Profit', 'Revenue Δ', 'Profit Δ']
-
-        st.dataframe(
-            mom_df,
-            width='stretch',
-            hide_index=True,
-            column_config={
-                'Revenue': st.column_config.TextColumn(width='medium'),
-                'Profit': st.column_config.TextColumn(width='medium'),
-                'Revenue Δ': st.column_config.TextColumn(width='small'),
-                'Profit Δ': st.column_config.TextColumn(width='small'),
-            }
-        )
+    # Aggregate by month
+    mom_df = df.groupby(month).agg({
+        'revenue': 'sum',
+        'profit': 'sum',
+        'revenue_mom_change': 'mean',
+        'profit_mom_change': 'mean'
+    }).reset_index(names='month')
+
+    mom_df['month'] = np.datetime_as_string(mom_df['month'].values.astype('datetime64[M]'), unit='M')
+    mom_df = mom_df.sort_values('month', ascending=False)
+
+    # Format columns
+    mom_df['revenue'] = format_currency_vec(mom_df['revenue'])
+    mom_df['profit'] = format_currency_vec(mom_df['profit'])
+    mom_df['revenue_mom_change'] = format_change_vec(mom_df['revenue_mom_change'])
+    mom_df['profit_mom_change'] = format_change_vec(mom_df['profit_mom_change'])
 
+    mom_df.columns = ['Month', 'Revenue', 'Profit', 'Revenue Δ', 'Profit Δ']
 
-def create_department_detail_table(df: pd.DataFrame) -> None:
+    st.dataframe(
+        mom_df,
+        width='stretch',
+        hide_index=True,
+        column_config={
+            'Revenue': st.column_config.TextColumn(width='medium'),
+            'Profit': st.column_config.TextColumn(width='medium'),
+            'Revenue Δ': st.column_config.TextColumn(width='small'),
+            'Profit Δ': st.column_config.TextColumn(width='small'),
+        }
+    )
+
+
+def create_department_detail_table(dept_agg: pd.DataFrame) -> None:
     """Create detailed department summary table"""
     st.markdown('<p class="section-header">Department Performance Details</p>', unsafe_allow_html=True)
 
-    # Aggregate by department
-    dept_detail = df.groupby('department').agg({
-        'revenue': ['sum', 'mean'],
-        'profit': ['sum', 'mean'],
-        'gross_margin': 'mean',
-        'payroll_ratio': 'mean'
-    }).reset_index()
+    dept_detail = dept_agg[['department', 'total_revenue', 'avg_revenue', 'total_profit',
+                            'avg_profit', 'gross_margin', 'payroll_ratio']]
 
-    # Flatten column names
+    # Rename columns for display
     dept_detail.columns = ['Department', 'Total Revenue', 'Avg Revenue', 'Total Profit',
                           'Avg Profit', 'Avg Margin', 'Avg Payroll Ratio']
 
     # Format columns
-    dept_detail['Total Revenue'] = dept_detail['Total Revenue'].apply(format_currency)
-    dept_detail['Avg Revenue'] = dept_detail['Avg Revenue'].apply(format_currency)
-    dept_detail['Total Profit'] = dept_detail['Total Profit'].apply(format_currency)
-    dept_detail['Avg Profit'] = dept_detail['Avg Profit'].apply(format_currency)
-    dept_detail['Avg Margin'] = dept_detail['Avg Margin'].apply(format_percentage)
-    dept_detail['Avg Payroll Ratio'] = dept_detail['Avg Payroll Ratio'].apply(format_percentage)
+    dept_detail['Total Revenue'] = format_currency_vec(dept_detail['Total Revenue'])
+    dept_detail['Avg Revenue'] = format_currency_vec(dept_detail['Avg Revenue'])
+    dept_detail['Total Profit'] = format_currency_vec(dept_detail['Total Profit'])
+    dept_detail['Avg Profit'] = format_currency_vec(dept_detail['Avg Profit'])
+    dept_detail['Avg Margin'] = format_percentage_vec(dept_detail['Avg Margin'])
+    dept_detail['Avg Payroll Ratio'] = format_percentage_vec(dept_detail['Avg Payroll Ratio'])
 
     st.dataframe(
         dept_detail,
@@ -367,14 +465,12 @@ def main():
     st.markdown("### Business Intelligence Analytics")
     st.markdown("---")
 
-import os
-
-# Determine base path for local vs deployment
-base_path = os.path.dirname(os.path.abspath(__file__))
-default_file = os.path.join(base_path, "bi_dataset.csv")
+    # Determine base path for local vs deployment
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    default_file = os.path.join(base_path, "bi_dataset.parquet")
 
-# File path input
-file_path = st.sidebar.text_input("Data File Path", value=default_file)
+    # File path input
+    file_path = st.sidebar.text_input("Data File Path", value=default_file)
 
     # Sidebar filters
     st.sidebar.markdown("---")
@@ -382,54 +478,50 @@ file_path = st.sidebar.text_input("Data File Path", value=default_file)
 
     try:
         # Load data
-        df = load_data(file_path)
-        df = clean_data(df)
+        stat = os.stat(file_path)
+        data_key = (file_path, stat.st_mtime, stat.st_size)
+        df = load_data(*data_key)
 
         # Department filter
-        departments = ["All"] + sorted(df['department'].dropna().unique().tolist())
+        departments = ["All"] + df['department'].cat.categories.tolist()
         selected_dept = st.sidebar.selectbox("Department", departments)
 
         # Date range filter
-        if 'date' in df.columns:
-            date_min = df['date'].min()
-            date_max = df['date'].max()
-            date_range = st.sidebar.date_input(
-                "Date Range",
-                value=(date_min, date_max),
-                help="Select date range for analysis"
-            )
+        date_min = df['date'].min()
+        date_max = df['date'].max()
+        date_range = st.sidebar.date_input(
+            "Date Range",
+            value=(date_min, date_max),
+            help="Select date range for analysis"
+        )
 
         # Apply filters
-        filtered_df = df.copy()
-        if selected_dept != "All":
-            filtered_df = filtered_df[filtered_df['department'] == selected_dept]
-
-        if 'date' in df.columns and len(date_range) == 2:
-            filtered_df = filtered_df[
-                (filtered_df['date'] >= pd.to_datetime(date_range[0])) &
-                (filtered_df['date'] <= pd.to_datetime(date_range[1]))
-            ]
+        start, end = None, None
+        if len(date_range) == 2:
+            start, end = pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1])
+        filtered_df = filter_data(df, start, end, selected_dept)
 
         # Display metrics
         create_kpi_cards(filtered_df)
         st.markdown("---")
 
         # Charts
-        if 'date' in filtered_df.columns:
-            create_trend_chart(filtered_df)
-            st.markdown("---")
+        create_trend_chart(filtered_df)
+        st.markdown("---")
+
+        dept_agg = aggregate_departments(filtered_df, data_key, start, end, selected_dept)
 
-        create_department_chart(filtered_df)
+        create_department_chart(dept_agg)
         st.markdown("---")
 
-        create_margin_comparison(filtered_df)
+        create_margin_comparison(dept_agg)
         st.markdown("---")
 
         # Tables
         create_mom_variance_table(filtered_df)
         st.markdown("---")
 
-        create_department_detail_table(filtered_df)
+        create_department_detail_table(dept_agg)
 
         # Footer
         st.markdown("---")
@@ -442,7 +534,7 @@ file_path = st.sidebar.text_input("Data File Path", value=default_file)
 
     except FileNotFoundError:
         st.error(f"File not found: {file_path}")
-        st.info("Please ensure the CSV file exists and the path is correct.")
+        st.info("Please ensure the data file exists and the path is correct.")
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
         st.info("Please check your data format matches the expected schema.")
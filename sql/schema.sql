@@ -16,6 +16,21 @@ CREATE TABLE IF NOT EXISTS department_summary (
     department TEXT,
     total_revenue REAL,
     total_profit REAL,
+    avg_revenue REAL,
+    avg_profit REAL,
     avg_margin REAL,
-    avg_payroll_ratio REAL
+    avg_payroll_ratio REAL,
+    avg_operating_cost_ratio REAL
+);
+
+CREATE TABLE IF NOT EXISTS department_monthly (
+    department TEXT,
+    month TEXT,
+    total_revenue REAL,
+    total_profit REAL,
+    total_operating_cost REAL,
+    total_payroll_cost REAL,
+    avg_margin REAL,
+    avg_payroll_ratio REAL,
+    avg_operating_cost_ratio REAL
 );
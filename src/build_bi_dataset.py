@@ -0,0 +1,9 @@
+import pandas as pd
+
+# bi_dataset.csv is the editable source; the dashboards read the Parquet copy
+df = pd.read_csv("bi_dataset.csv", parse_dates=["date"])
+df["date"] = df["date"].astype("datetime64[ns]")
+
+df.to_parquet("bi_dataset.parquet", engine="pyarrow", compression="zstd", index=False)
+
+print("BI dataset converted:", len(df), "rows")
@@ -1,28 +1,70 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as csv
+import pyarrow.parquet as pq
 
-df = pd.read_csv("data/raw/financials.csv")
+numeric_cols = ["revenue", "operating_cost", "payroll_cost"]
 
-# Convert date column
-df["date"] = pd.to_datetime(df["date"], errors="coerce")
+# Output schema of the clean dataset
+schema = pa.schema(
+    [("date", pa.timestamp("s")), ("department", pa.string())]
+    + [(col, pa.float64()) for col in numeric_cols]
+    + [("profit", pa.float64())]
+)
 
-# Drop rows with missing critical values
-df = df.dropna(subset=["date", "department"])
+# Plain decimal or scientific-notation number
+NUMBER_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
 
-# Convert numeric columns
-for col in ["revenue", "operating_cost", "payroll_cost"]:
-    df[col] = pd.to_numeric(df[col], errors="coerce")
 
-# Remove invalid records
-df = df[
-    (df["revenue"] >= 0) &
-    (df["operating_cost"] >= 0) &
-    (df["payroll_cost"] >= 0)
-]
+def to_float(values):
+    """Cast a string column to float64, turning unparseable values into null"""
+    values = pc.utf8_trim_whitespace(values)
+    numeric = pc.match_substring_regex(values, NUMBER_PATTERN)
+    return pc.cast(pc.if_else(numeric, values, pa.scalar(None, pa.string())), pa.float64())
 
-# Create profit metric
-df["profit"] = df["revenue"] - (df["operating_cost"] + df["payroll_cost"])
 
-# Save clean dataset
-df.to_csv("data/processed/financials_clean.csv", index=False)
+# Stream the raw file in record batches so memory stays flat regardless of input size.
+# Everything is read as strings (empty fields become null) and converted per batch,
+# so a malformed value drops its row instead of aborting the run.
+reader = csv.open_csv(
+    "data/raw/financials.csv",
+    read_options=csv.ReadOptions(block_size=1 << 20),
+    convert_options=csv.ConvertOptions(
+        include_columns=["date", "department"] + numeric_cols,
+        column_types={col: pa.string() for col in ["date", "department"] + numeric_cols},
+        strings_can_be_null=True
+    )
+)
 
-print("Clean dataset created:", len(df), "rows")
+# Drop rows with missing critical values and invalid records
+valid = (
+    pc.field("date").is_valid() &
+    pc.field("department").is_valid() &
+    (pc.field("department") != "") &
+    (pc.field("revenue") >= 0) &
+    (pc.field("operating_cost") >= 0) &
+    (pc.field("payroll_cost") >= 0)
+)
+
+rows = 0
+with pq.ParquetWriter("data/processed/financials_clean.parquet", schema, compression="zstd") as writer:
+    for batch in reader:
+        table = pa.Table.from_batches([batch])
+
+        # Convert date and numeric columns (unparseable values become null)
+        date = pd.to_datetime(table["date"].to_pandas(), errors="coerce")
+        date = pa.Array.from_pandas(date).cast(pa.timestamp("s"), safe=False)
+        table = table.set_column(0, "date", date)
+        for col in numeric_cols:
+            table = table.set_column(table.schema.get_field_index(col), col, to_float(table[col]))
+        table = table.filter(valid)
+
+        # Create profit metric
+        profit = pc.subtract(table["revenue"], pc.add(table["operating_cost"], table["payroll_cost"]))
+        table = table.append_column("profit", profit)
+
+        writer.write_table(table.cast(schema))
+        rows += table.num_rows
+
+print("Clean dataset created:", rows, "rows")
@@ -1,18 +1,39 @@
 import pandas as pd
 
-df = pd.read_csv("data/processed/financials_kpi.csv")
+df = pd.read_parquet("data/processed/financials_kpi.parquet", engine="pyarrow")
 
+# Department totals and averages over the full period
 summary = (
-    df.groupby("department")
+    df.groupby("department", observed=True)
     .agg(
         total_revenue=("revenue", "sum"),
         total_profit=("profit", "sum"),
+        avg_revenue=("revenue", "mean"),
+        avg_profit=("profit", "mean"),
         avg_margin=("gross_margin", "mean"),
-        avg_payroll_ratio=("payroll_ratio", "mean")
+        avg_payroll_ratio=("payroll_ratio", "mean"),
+        avg_operating_cost_ratio=("operating_cost_ratio", "mean")
     )
     .reset_index()
 )
 
-summary.to_csv("data/processed/department_summary.csv", index=False)
+# Department x month summary, so consumers can slice by period without re-aggregating rows
+month = pd.Index(df["date"].values.astype("datetime64[M]"), name="month")
+monthly = (
+    df.groupby(["department", month], observed=True)
+    .agg(
+        total_revenue=("revenue", "sum"),
+        total_profit=("profit", "sum"),
+        total_operating_cost=("operating_cost", "sum"),
+        total_payroll_cost=("payroll_cost", "sum"),
+        avg_margin=("gross_margin", "mean"),
+        avg_payroll_ratio=("payroll_ratio", "mean"),
+        avg_operating_cost_ratio=("operating_cost_ratio", "mean")
+    )
+    .reset_index()
+)
+
+summary.to_parquet("data/processed/department_summary.parquet", engine="pyarrow", compression="zstd", index=False)
+monthly.to_parquet("data/processed/department_monthly.parquet", engine="pyarrow", compression="zstd", index=False)
 
 print("Department-level summary created")
@@ -1,13 +1,45 @@
 import pandas as pd
 import sqlite3
 
-conn = sqlite3.connect("financials.db")
+# Autocommit mode; the load below manages its own transaction
+conn = sqlite3.connect("financials.db", isolation_level=None)
 
-financials = pd.read_csv("data/processed/financials_kpi.csv")
-summary = pd.read_csv("data/processed/department_summary.csv")
+# Bulk-load settings: in-memory rollback journal, no fsync per write, temp storage in memory
+# (journal_mode=MEMORY is not persisted, so the database file stays in rollback-journal mode)
+conn.execute("PRAGMA journal_mode=MEMORY")
+conn.execute("PRAGMA synchronous=OFF")
+conn.execute("PRAGMA temp_store=MEMORY")
 
-financials.to_sql("financials", conn, if_exists="replace", index=False)
-summary.to_sql("department_summary", conn, if_exists="replace", index=False)
+financials = pd.read_parquet("data/processed/financials_kpi.parquet", engine="pyarrow")
+summary = pd.read_parquet("data/processed/department_summary.parquet", engine="pyarrow")
+monthly = pd.read_parquet("data/processed/department_monthly.parquet", engine="pyarrow")
+
+# Keep dates stored as ISO date text in SQLite
+financials["date"] = financials["date"].dt.strftime("%Y-%m-%d")
+monthly["month"] = monthly["month"].dt.strftime("%Y-%m")
+
+
+def replace_table(conn, name, df):
+    """Recreate a table from the frame's schema and bulk insert its rows"""
+    conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+    conn.execute(pd.io.sql.get_schema(df, name, con=conn))
+    placeholders = ", ".join("?" * len(df.columns))
+    conn.executemany(
+        f'INSERT INTO "{name}" VALUES ({placeholders})',
+        df.itertuples(index=False, name=None)
+    )
+
+
+# Single transaction for all tables
+conn.execute("BEGIN")
+try:
+    replace_table(conn, "financials", financials)
+    replace_table(conn, "department_summary", summary)
+    replace_table(conn, "department_monthly", monthly)
+    conn.execute("COMMIT")
+except Exception:
+    conn.execute("ROLLBACK")
+    raise
 
 conn.close()
 